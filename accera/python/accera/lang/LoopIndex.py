@@ -9,6 +9,8 @@ class LoopIndex:
         self._nest = nest
         self.base_index = id(self)
         self._name = name
+        # the native counterpart of this index, set while a native context is being built
+        self._native = None
 
     def __eq__(self, other):
         return id(self) == id(other)
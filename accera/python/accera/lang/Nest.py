@@ -113,7 +113,7 @@ class Nest:
         self._logic_fns.append(wrapped_logic)
 
         self._commands.append(
-            partial(self._add_iteration_logic, wrapped_logic, predicate, placement)
+            (self._add_iteration_logic, (wrapped_logic, predicate, placement))
         )
 
     def _add_iteration_logic(
@@ -222,11 +222,14 @@ class Nest:
         )
         logic_args.update(index_handles_to_native_index)
 
+        for (_, index), native_index in zip(self._shape, native_indices):
+            index._native = native_index
+
         context.mapping.update(logic_args)
 
     def _build_with_native_context(self, context: NativeLoopNestContext):
-        for cmd in self._commands:
-            cmd(context)
+        for fn, args in self._commands:
+            fn(*args, context)
 
     def _init_delayed(self, shape: List[int]):
         resolved_shape = [(shape[i], self._shape[i][1]) for i in range(0, len(shape))]
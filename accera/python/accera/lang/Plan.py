@@ -5,7 +5,10 @@
 
 import logging
 from typing import *
-from functools import partial, reduce
+from functools import reduce
+from itertools import count
+from secrets import token_hex
+from collections import defaultdict
 from collections.abc import Iterable
 
 from ..Parameter import DelayedParameter
@@ -27,7 +30,10 @@ from .._lang_python._lang import (
     MMASchedulingPolicy,
     MMAShape,
     CacheStrategy,
-    MMAFragmentOp
+    MMAFragmentOp,
+    _ParallelizationPolicy,
+    _GPU,
+    _Dim3
 )
 from ..algorithms import *
 
@@ -35,6 +41,39 @@ from ..algorithms import *
 def _ceildiv(x, y):
     return ((x - 1) // y) + 1
 
+
+# Opcodes for the delayed-call list. Using small integers instead of partial(self.method)
+# dict keys avoids a per-call partial allocation and keeps replay ordered and linear.
+_OP_UNROLL = 0
+_OP_VECTORIZE = 1
+_OP_PARALLELIZE = 2
+_OP_CACHE = 3
+_OP_BIND = 4
+_OP_KERNELIZE = 5
+
+
+def _split_delayed_params(params: dict):
+    """Splits a parameter dict into (static_items, delayed_items) so that replay only
+    needs to re-resolve the delayed subset."""
+    static_items = {}
+    delayed_items = []
+    for key, value in params.items():
+        if isinstance(key, DelayedParameter) or isinstance(value, DelayedParameter):
+            delayed_items.append((key, value))
+        else:
+            static_items[key] = value
+    return static_items, delayed_items
+
+
+def _resolve_delayed_params(split):
+    static_items, delayed_items = split
+    resolved = dict(static_items)
+    for key, value in delayed_items:
+        resolved_key = key.get_value() if isinstance(key, DelayedParameter) else key
+        resolved[resolved_key] = value.get_value() if isinstance(value, DelayedParameter) else value
+    return resolved
+
+
 class Plan:
     def __init__(self, schedule: Schedule, target: Target, _dynamic_shared_memory_size: int, _blocks_per_SM: int):
         self._sched = schedule
@@ -42,22 +81,22 @@ class Plan:
         self._dynamic_shared_memory_size = _dynamic_shared_memory_size
         self._blocks_per_SM = _blocks_per_SM
         self._commands = []
-        self._delayed_calls = {}
-        self._index_attrs: Mapping[LoopIndex, List[str]] = {}
+        self._delayed_calls = []
+        self._replay_program = None
+        self._index_attrs: Mapping[LoopIndex, List[str]] = defaultdict(list)
         self._dynamic_dependencies = set()
         self._bindings = {}
         self._heuristic_params = []
 
-        if (
-            target.category == Target.Category.GPU
-            and target.runtime == Target.Runtime.VULKAN
-        ):
+        # cache the category tests so per-command execution doesn't repeat enum comparisons
+        self._is_gpu = target is not None and target.category == Target.Category.GPU
+        self._is_cpu = target is not None and target.category == Target.Category.CPU
+
+        if self._is_gpu and target.runtime == Target.Runtime.VULKAN:
             self._dynamic_dependencies.add(LibraryDependency.VULKAN)
 
     def _add_index_attr(self, index: LoopIndex, attr: str):
-        attrs = self._index_attrs.get(index, [])
-        attrs.append(attr)
-        self._index_attrs[index] = attrs
+        self._index_attrs[index].append(attr)
 
     def print(self):
         self._sched.print(lambda index: self._index_attrs.get(index, []))
@@ -81,7 +120,7 @@ class Plan:
             heuristic.create_parameterized_args(self)
             self._heuristic_params.append(heuristic._params_list)
             heuristic.invoke_cache_dsl_command(self)
-        self._commands.append(partial(self._auto, heuristics))
+        self._commands.append((self._auto, (heuristics, )))
 
     def _auto(
         self,
@@ -98,17 +137,15 @@ class Plan:
             index: The dimension to unroll
         """
         if isinstance(index, DelayedParameter):
-            self._delayed_calls[partial(self.unroll)] = index
+            self._delayed_calls.append((_OP_UNROLL, index))
             return None
 
         self._add_index_attr(index, "unrolled")
-        self._commands.append(partial(self._unroll, index))
+        self._commands.append((self._unroll, (index, )))
 
     def _unroll(self, index, context: NativeLoopNestContext):
-        native_index = context.mapping[id(index)]
-
         # TODO: Move to final location depending on where unroll should be
-        context.schedule.unroll(native_index)
+        context.schedule.unroll(index._native)
 
     def vectorize(self, index: Union[LoopIndex, DelayedParameter]):
         """Only available for targets that have SIMD registers and support vector instructions. Marks a dimension of the iteration-space for vectorization.
@@ -116,7 +153,7 @@ class Plan:
             index: The index to vectorize
         """
         if isinstance(index, DelayedParameter):
-            self._delayed_calls[partial(self.vectorize)] = index
+            self._delayed_calls.append((_OP_VECTORIZE, index))
             return None
 
         if not self._target.vectorization_info:
@@ -125,11 +162,11 @@ class Plan:
         self._add_index_attr(index, "vectorized")
 
         self._commands.append(
-            partial(self._vectorize, index, self._target.vectorization_info)
+            (self._vectorize, (index, self._target.vectorization_info))
         )
 
     def _vectorize(self, index, vectorization_info, context: NativeLoopNestContext):
-        context.plan.vectorize(context.mapping[id(index)], vectorization_info)
+        context.plan.vectorize(index._native, vectorization_info)
 
     def parallelize(
         self,
@@ -153,26 +190,28 @@ class Plan:
             policy: The scheduling policy to apply ("dynamic" or "static").
             max_threads: The maximum number of threads to use when distributing the workload.
         """
-        if self._target.category == Target.Category.CPU:
+        if self._is_cpu:
             self._dynamic_dependencies.add(LibraryDependency.OPENMP)
 
-        if any([isinstance(arg, DelayedParameter) for arg in [indices, pin, policy, max_threads]]):
-            self._delayed_calls[partial(self.parallelize)] = {
+        if any(isinstance(arg, DelayedParameter) for arg in (indices, pin, policy, max_threads)):
+            self._delayed_calls.append((_OP_PARALLELIZE, _split_delayed_params({
                 "indices": indices,
                 "pin": pin,
                 "policy": policy,
                 "max_threads": max_threads
-            }
+            })))
             return None
 
         indices = [indices] if isinstance(indices, LoopIndex) else list(indices)
 
         # ensure the indices are contiguous and follow the Schedule ordering
-        start = self._sched._indices.index(indices[0])
-        end = start + len(indices)
+        start = self._sched._position_of(indices[0])
         if (
-            end > len(self._sched._indices)
-            or indices != self._sched._indices[start:end]
+            start + len(indices) > len(self._sched._indices)
+            or any(
+                self._sched._position_of(index) != start + pos
+                for pos, index in enumerate(indices[1:], 1)
+            )
         ):
             raise ValueError(
                 "indices must be contiguous in the Schedule dimension order"
@@ -181,11 +220,9 @@ class Plan:
         for index in indices:
             self._add_index_attr(index, "parallelized")
 
-        self._commands.append(partial(self._parallelize, indices, policy, max_threads))
+        self._commands.append((self._parallelize, (indices, policy, max_threads)))
 
     def _parallelize(self, indices, policy, max_threads, context: NativeLoopNestContext):
-        from .._lang_python._lang import _ParallelizationPolicy
-
         if max_threads is None:
             max_threads = self._target.num_threads
         elif max_threads <= 0:
@@ -195,7 +232,7 @@ class Plan:
         num_threads = min(max_threads, self._target.num_threads, self._sched._get_num_split_iterations(indices))
         logging.debug(f"Parallelizing with {num_threads} thread(s)")
 
-        idxs = [context.mapping[id(index)] for index in indices]
+        idxs = [index._native for index in indices]
 
         context.plan.parallelize(
             idxs,
@@ -238,7 +275,7 @@ class Plan:
             prologue_op: The pre-tensorization operation to run on matrix fragment data as a part of load, e.g. 0-init (CLEAR).
             epilogue_op: The post-tensorization operation to run on matrix fragment data as a part of store, e.g. ReLU.
         """
-        if self._target.category != Target.Category.GPU:
+        if not self._is_gpu:
             raise ValueError("tensorization currently only supported on GPU targets")
 
         indices = [indices] if isinstance(indices, LoopIndex) else list(indices)
@@ -249,9 +286,9 @@ class Plan:
         for index in indices:
             self._add_index_attr(index, "tensorized")
 
-        self._commands.append(
-            partial(
-                self._tensorize,
+        self._commands.append((
+            self._tensorize,
+            (
                 indices,
                 mma_shape,
                 num_total_passes,
@@ -264,7 +301,7 @@ class Plan:
                 epilogue_arg,
                 _use_rocWMMA,
             )
-        )
+        ))
 
     def _tensorize(
         self,
@@ -362,7 +399,7 @@ class Plan:
                 mma_shape,
             )
 
-        idxs = [context.mapping[id(index)] for index in indices]
+        idxs = [index._native for index in indices]
 
         context.plan.tensorize(
             indices=idxs,
@@ -420,27 +457,22 @@ class Plan:
                 | MemorySpace.SHARED  | True          | MemorySpace.PRIVATE             |
                 | !MemorySpace.SHARED | True          | Same value as location          |
         """
-        if (
-            any(
-                [
-                    isinstance(arg, DelayedParameter)
-                    for arg in (
-                        index,
-                        trigger_index,
-                        level,
-                        trigger_level,
-                        thrifty,
-                        double_buffer,
-                        double_buffer_location,
-                        vectorize,
-                        layout,
-                        element_type,
-                        _shared_memory_offset
-                    )
-                ]
-            )
+        is_deferred = (
+            isinstance(index, DelayedParameter)
+            or isinstance(trigger_index, DelayedParameter)
+            or isinstance(level, DelayedParameter)
+            or isinstance(trigger_level, DelayedParameter)
+            or isinstance(thrifty, DelayedParameter)
+            or isinstance(double_buffer, DelayedParameter)
+            or isinstance(double_buffer_location, DelayedParameter)
+            or isinstance(vectorize, DelayedParameter)
+            or isinstance(layout, DelayedParameter)
+            or isinstance(element_type, DelayedParameter)
+            or isinstance(_shared_memory_offset, DelayedParameter)
             or (isinstance(source, DelayedCache) and not source.completed)
-        ):
+        )
+
+        if is_deferred:
             # If any of the cache level arguments are parameters, then this cache call is incomplete until those parameters
             # have values. Additionally, if this is a hierarchical cache and an outer cache is parameterized,
             # then this cache call is also incomplete until the outer cache's parameters have values
@@ -448,15 +480,13 @@ class Plan:
             # Create an incomplete Cache object so hierarchical caches that depend on this cache handle can
             # have an object to hold onto
             delayed_cache = DelayedCache(plan=self, target=source)
-            self._delayed_calls[
-                partial(
-                    self.cache,
-                    source=source,
-                    max_elements=max_elements,
-                    location=location,
-                    _delayed_cache=delayed_cache,
-                )
-            ] = {
+            static_kwargs = {
+                "source": source,
+                "max_elements": max_elements,
+                "location": location,
+                "_delayed_cache": delayed_cache,
+            }
+            self._delayed_calls.append((_OP_CACHE, (static_kwargs, _split_delayed_params({
                 "index": index,
                 "trigger_index": trigger_index,
                 "level": level,
@@ -468,7 +498,7 @@ class Plan:
                 "_shared_memory_offset": _shared_memory_offset,
                 "vectorize": vectorize,
                 "element_type": element_type
-            }
+            }))))
             return delayed_cache
 
         if sum(i is not None for i in [index, level, max_elements]) != 1:
@@ -496,10 +526,10 @@ class Plan:
                 "double_buffer_location is only valid to specify when double_buffer is set to True"
             )
 
-        if self._target.category == Target.Category.GPU and location == _MemorySpace.GLOBAL:
+        if self._is_gpu and location == _MemorySpace.GLOBAL:
             raise ValueError("Global memory caches are not yet supported on GPU targets.")
 
-        if self._target.category == Target.Category.CPU and strategy != AUTO:
+        if self._is_cpu and strategy != AUTO:
             raise ValueError("Only AUTO strategy is supported on the CPU")
 
         if strategy == AUTO:
@@ -513,10 +543,7 @@ class Plan:
 
         if double_buffer_location is AUTO:
             if double_buffer:
-                if (
-                    self._target.category == Target.Category.GPU
-                    and location == _MemorySpace.SHARED
-                ):
+                if self._is_gpu and location == _MemorySpace.SHARED:
                     double_buffer_location = _MemorySpace.PRIVATE
                 else:
                     double_buffer_location = location
@@ -545,7 +572,7 @@ class Plan:
                 index = self._sched._indices[-level]
             else:
                 self._add_index_attr(index, "cache")
-                index_pos = self._sched._indices.index(index)
+                index_pos = self._sched._position_of(index)
                 level = len(self._sched._indices) - index_pos
 
             multicaching_roles = [
@@ -579,7 +606,7 @@ class Plan:
                 trigger_index = self._sched._indices[-trigger_level]
             else:
                 self._add_index_attr(trigger_index, "trigger")
-                trigger_index_pos = self._sched._indices.index(trigger_index)
+                trigger_index_pos = self._sched._position_of(trigger_index)
                 trigger_level = len(self._sched._indices) - trigger_index_pos
 
             if level > trigger_level:
@@ -649,16 +676,14 @@ class Plan:
             _delayed_cache.complete(cache)
             cache = _delayed_cache
             if _delayed_cache.enqueue_command:
-                self._commands.append(partial(self._add_cache, cache))
+                self._commands.append((self._add_cache, (cache, )))
                 _delayed_cache.enqueue_command = False
         else:
-            self._commands.append(partial(self._add_cache, cache))
+            self._commands.append((self._add_cache, (cache, )))
 
         return cache
 
     def _add_cache(self, cache, context: NativeLoopNestContext):
-        from ..Targets import Target
-
         # Resolve vectorize=AUTO to either True or False since vectorize() will have been called by this point
         if cache.vectorize is AUTO:
             cache.vectorize = False
@@ -670,10 +695,10 @@ class Plan:
         if cache.vectorize:
             vectorization_info = self._target.vectorization_info
 
-        last_in_index = context.mapping[id(cache.index)] if cache.index else None
+        last_in_index = cache.index._native if cache.index else None
 
         trigger_index = (
-            context.mapping[id(cache.trigger_index)]
+            cache.trigger_index._native
             if cache.trigger_index
             else last_in_index
         )
@@ -723,15 +748,10 @@ class Plan:
         if target.role != Role.CONST:
             raise ValueError("Can only pack and embed constant data buffers")
 
-        self._commands.append(
-            partial(
-                self._pack_and_embed_buffer,
-                target,
-                wrapper_fn_name,
-                packed_buffer_name,
-                indexing,
-            )
-        )
+        self._commands.append((
+            self._pack_and_embed_buffer,
+            (target, wrapper_fn_name, packed_buffer_name, indexing)
+        ))
 
     def emit_runtime_init_pack(
         self,
@@ -749,15 +769,10 @@ class Plan:
             indexing: The cache indexing
         """
         # TODO: Make this work with multiple kernels, fused schedules
-        self._commands.append(
-            partial(
-                self._emit_runtime_init_packing,
-                target,
-                packing_func_name,
-                packed_buf_size_func_name,
-                indexing,
-            )
-        )
+        self._commands.append((
+            self._emit_runtime_init_packing,
+            (target, packing_func_name, packed_buf_size_func_name, indexing)
+        ))
 
     def _pack_and_embed_buffer(
         self,
@@ -797,18 +812,16 @@ class Plan:
             mapping: Mapping of indices to GPU thread or block identifiers
         """
 
-        if self._target is not None and self._target.category == Target.Category.GPU:
+        if self._is_gpu:
             if any(
-                [
-                    isinstance(index, DelayedParameter)
-                    or isinstance(proc, DelayedParameter)
-                    for index, proc in mapping.items()
-                ]
+                isinstance(index, DelayedParameter)
+                or isinstance(proc, DelayedParameter)
+                for index, proc in mapping.items()
             ):
-                self._delayed_calls[partial(self.bind)] = mapping
+                self._delayed_calls.append((_OP_BIND, _split_delayed_params(mapping)))
                 return None
 
-            self._commands.append(partial(self._bind, mapping))
+            self._commands.append((self._bind, (mapping, )))
 
             for index_or_tuple, proc in mapping.items():
                 self._bindings[proc] = index_or_tuple
@@ -819,9 +832,9 @@ class Plan:
     def _bind(self, mapping: Mapping[Union[LoopIndex, Tuple[LoopIndex]], GridUnits], context: NativeLoopNestContext):
         for index_or_tuple, proc in mapping.items():
             if isinstance(index_or_tuple, tuple):
-                resolved_index_or_tuple = [context.mapping[id(index)] for index in index_or_tuple]
+                resolved_index_or_tuple = [index._native for index in index_or_tuple]
             else:
-                resolved_index_or_tuple = [context.mapping[id(index_or_tuple)]]
+                resolved_index_or_tuple = [index_or_tuple._native]
             context.plan._map_index_to_processor(resolved_index_or_tuple, proc.value)
 
     def kernelize(
@@ -850,10 +863,10 @@ class Plan:
         if isinstance(unroll_indices, DelayedParameter) or isinstance(
             vectorize_indices, DelayedParameter
         ):
-            self._delayed_calls[partial(self.kernelize)] = {
+            self._delayed_calls.append((_OP_KERNELIZE, _split_delayed_params({
                 "unroll_indices": unroll_indices,
                 "vectorize_indices": vectorize_indices,
-            }
+            })))
             return None
 
         vindices = (
@@ -861,8 +874,10 @@ class Plan:
             if isinstance(vectorize_indices, LoopIndex)
             else list(vectorize_indices)
         )
+        # identity-based set membership instead of an O(n*m) scan over the unroll indices
+        unroll_index_ids = {id(u) for u in unroll_indices}
         for vidx in vindices:
-            if vidx in unroll_indices:
+            if id(vidx) in unroll_index_ids:
                 raise ValueError(
                     "vectorize_indices cannot be one of the unroll indices"
                 )
@@ -881,17 +896,19 @@ class Plan:
         sched = self._sched
         nest = sched._nest
 
-        # lookup the split factors for each loop index
+        # lookup the split factors for each loop index, reading the index entries
+        # directly instead of paying a method call plus dict lookup per index
+        index_map = sched._index_map
         index_to_splitfactor_map = {}
 
-        for i in self._sched.get_indices():
-            transform = self._sched.get_index_transform(i)
+        for i in sched._indices:
+            transform = index_map[i].transform
             if transform and transform[0] is IndexTransform.SPLIT:
                 index_to_splitfactor_map[i] = transform[1]
 
         def units_to_dim(units, dims):
             def compute_index_itercount(idx):
-                begin, end, step = self._sched.get_index_range(idx)
+                begin, end, step = index_map[idx].interval()
                 if step == 1 and idx in index_to_splitfactor_map:
                     return index_to_splitfactor_map[idx]
                 else:
@@ -978,20 +995,16 @@ class Plan:
         for index in indices:
             self._add_index_attr(index, "_erase")
 
-        self._commands.append(
-            partial(self._erase_loops_delayed, indices)
-        )
+        self._commands.append((self._erase_loops_delayed, (indices, )))
 
     def _erase_loops_delayed(self, indices: List[LoopIndex], context: NativeLoopNestContext):
         for index in indices:
-            context.plan._erase_loop(context.mapping[id(index)])
+            context.plan._erase_loop(index._native)
 
     def _build_native_context(self, context: NativeLoopNestContext):
         target = self._target
 
-        if target and target.category == Target.Category.GPU:
-            from .._lang_python._lang import _GPU, _Dim3
-
+        if self._is_gpu:
             assert isinstance(self._sched, Schedule)
 
             block_dims, grid_dims = self._calc_block_grid_dim()
@@ -1011,8 +1024,9 @@ class Plan:
             context.plan = context.schedule.create_plan()
 
     def _build_with_native_context(self, context: NativeLoopNestContext):
-        for cmd in self._commands:
-            cmd(context)
+        # commands are (bound method, args) tuples; see the append sites
+        for fn, args in self._commands:
+            fn(*args, context)
 
     def _replay_delayed_calls(self):
         """
@@ -1025,33 +1039,35 @@ class Plan:
 
         If there is no residual states between different method calls, no need to reset.
         """
-        for delayed_call in self._delayed_calls:
-            params = self._delayed_calls[delayed_call]
-            if isinstance(params, dict):
-                resolved_params = {
-                    key.get_value() if isinstance(key, DelayedParameter) \
-                        else key: params[key].get_value() if isinstance(params[key], DelayedParameter) \
-                        else params[key] \
-                            for key in params
-                }
-
-                # Some methods package the long list of arguments into a dict parameter, like Plan.cache, Plan.parallelize and Plan.kernelize
-                if delayed_call.func.__name__ == "bind":
-                    delayed_call(resolved_params)
-                elif delayed_call.func.__name__ == "cache" or \
-                    delayed_call.func.__name__ == "parallelize" or \
-                    delayed_call.func.__name__ == "kernelize":
-                    delayed_call(**resolved_params)
-                else:
-                    raise NotImplementedError(
-                        f"Please add the function Plan.{delayed_call.func.__name__} that supports parameters to the conditional list and indicate the way of dereferencing the dict parameter"
-                    )
+        if self._replay_program is None or len(self._replay_program) != len(self._delayed_calls):
+            self._replay_program = self._compile_replay_program()
+
+        for thunk in self._replay_program:
+            thunk()
+
+    def _compile_replay_program(self):
+        # Specialize each delayed call into a zero-argument thunk once, so that repeat
+        # replays (one per added function) skip the opcode dispatch and parameter-kind
+        # branching and only re-resolve the delayed parameter values
+        program = []
+        for op, params in self._delayed_calls:
+            if op == _OP_UNROLL:
+                thunk = lambda params=params: self.unroll(params.get_value())
+            elif op == _OP_VECTORIZE:
+                thunk = lambda params=params: self.vectorize(params.get_value())
+            elif op == _OP_PARALLELIZE:
+                thunk = lambda params=params: self.parallelize(**_resolve_delayed_params(params))
+            elif op == _OP_CACHE:
+                static_kwargs, split = params
+                thunk = lambda static_kwargs=static_kwargs, split=split: \
+                    self.cache(**static_kwargs, **_resolve_delayed_params(split))
+            elif op == _OP_BIND:
+                thunk = lambda params=params: self.bind(_resolve_delayed_params(params))
             else:
-                resolved_params = [
-                    param.get_value() if isinstance(param, DelayedParameter) else param
-                    for param in params
-                ]
-                delayed_call(*resolved_params)
+                assert op == _OP_KERNELIZE
+                thunk = lambda params=params: self.kernelize(**_resolve_delayed_params(params))
+            program.append(thunk)
+        return program
 
 
 def _build_native_nest(plan: "Plan", nest_args: List[Array]):
@@ -1060,14 +1076,16 @@ def _build_native_nest(plan: "Plan", nest_args: List[Array]):
     sched = plan._sched
     nest = sched._nest
 
-    for array_arg in nest_args:
-        if isinstance(array_arg, Array):
-            array_arg._replay_delayed_calls()
+    # Filter the Array arguments once up front; nest_wrapper_fn runs once per build and
+    # doesn't need to repeat the per-argument isinstance scan each time
+    array_args = [arg for arg in nest_args if isinstance(arg, Array)]
+
+    for array_arg in array_args:
+        array_arg._replay_delayed_calls()
 
     def build_array_native_context(ctx):
-        for array_arg in nest_args:
-            if isinstance(array_arg, Array):
-                array_arg._build_native_context(ctx)
+        for array_arg in array_args:
+            array_arg._build_native_context(ctx)
 
     def build_loopnest_native_context(ctx):
         nest._build_native_context(ctx)
@@ -1087,19 +1105,27 @@ def _build_native_nest(plan: "Plan", nest_args: List[Array]):
         build_array_native_context(loopnest_context)
         build_loopnest_native_context(loopnest_context)
 
-        nest._build_with_native_context(loopnest_context)
-        sched._build_with_native_context(loopnest_context)
-        plan._build_with_native_context(loopnest_context)
+        try:
+            nest._build_with_native_context(loopnest_context)
+            sched._build_with_native_context(loopnest_context)
+            plan._build_with_native_context(loopnest_context)
+        finally:
+            sched._clear_native_indices()
 
     return nest_wrapper_fn
 
 
+# One random token per process for cross-process uniqueness, then a plain counter.
+# token_hex consults the OS CSPRNG, which is a syscall we don't want to pay per function
+# when emitting thousands of kernels in a sweep.
+_function_name_prefix = f"nest_impl_{token_hex(4)}"
+_function_name_counter = count()
+
+
 def _create_function(
     plan: "Plan", args: List[Union[Array, Dimension]], public: bool = True, **kwargs
 ) -> Function:
-    from secrets import token_hex
-
-    name = f"nest_impl_{token_hex(16)}"
+    name = f"{_function_name_prefix}_{next(_function_name_counter):08x}"
 
     return Function(
         name=name,
@@ -46,6 +46,7 @@ class Schedule:
         self._delayed_calls = {}
         self._parameterized_index_map = {}
         self._indices = nest.get_indices()
+        self._index_pos = None
 
         shape = nest.get_shape()
         if any([isinstance(s, DelayedParameter) for s in shape]):
@@ -83,6 +84,16 @@ class Schedule:
     def get_index_range(self, index):
         return self._index_map[index].interval()
 
+    def _position_of(self, index) -> int:
+        # O(1) lookup of an index's position in the schedule order. The map is
+        # rebuilt lazily whenever self._indices has been mutated.
+        if self._index_pos is None:
+            self._index_pos = {idx: pos for pos, idx in enumerate(self._indices)}
+        try:
+            return self._index_pos[index]
+        except KeyError:
+            raise ValueError("Unknown index!")
+
     def get_index_parent(self, index):
         return self._index_map[index].parent
 
@@ -114,6 +125,7 @@ class Schedule:
                 inner_index.name = name
             order_pos = self._indices.index(index) + 1
             self._indices.insert(order_pos, inner_index)
+            self._index_pos = None
             self._index_map[index].inners.insert(0, inner_index)
             self._index_map[inner_index] = IndexEntry(
                 stop=0, parent=index, transform=(IndexTransform.SPLIT, 0)
@@ -130,6 +142,7 @@ class Schedule:
 
         order_pos = self._indices.index(index) + 1
         self._indices.insert(order_pos, inner_index)
+        self._index_pos = None
 
         start, stop, step = self._index_map[index].interval()
         self._index_map[index].step *= size
@@ -159,6 +172,7 @@ class Schedule:
 
         order_pos = self._indices.index(index)
         self._indices[order_pos] = skewed_index
+        self._index_pos = None
 
         start, stop, _ = self._index_map[index].interval()
         ref_start, ref_stop, _ = self._index_map[reference_index].interval()
@@ -199,6 +213,7 @@ class Schedule:
 
         order_pos = self._indices.index(index)
         self._indices[order_pos] = padded_index
+        self._index_pos = None
 
         start, stop, _ = self._index_map[index].interval()
 
@@ -263,6 +278,7 @@ class Schedule:
             visited.append(i)
 
         self._indices = indices
+        self._index_pos = None
 
     def tile(
         self, shape=Mapping[LoopIndex, Union[int, DelayedParameter]]
@@ -374,6 +390,7 @@ class Schedule:
                         raise NotImplementedError(f"Unsupported transform {transform}")
 
                     context.mapping[id(idx)] = native_idx
+                    idx._native = native_idx
                     return native_idx
 
             raise ValueError("Unknown index")
@@ -447,6 +464,12 @@ class Schedule:
                 else:
                     delayed_call(params)
 
+    def _clear_native_indices(self):
+        # Drop the native index references attached during a build so they
+        # don't keep native objects alive across builds
+        for index in self._index_map:
+            index._native = None
+
     def _resolve_index(self, index):
         if index not in self._index_map:
             raise ValueError("Unknown index!")
@@ -624,6 +647,7 @@ class FusedSchedule(Schedule):
         self._indices = (
             [self._fusing_index] + self._common_indices + self._unfused_indices
         )
+        self._index_pos = None
 
         self.reorder(self._common_indices + [self._fusing_index] + self._unfused_indices)
 
@@ -667,6 +691,12 @@ class FusedSchedule(Schedule):
 
         return super()._replay_delayed_calls()
 
+    def _clear_native_indices(self):
+        for s in self._schedules:
+            s._clear_native_indices()
+
+        super()._clear_native_indices()
+
     def _build_native_context(self, context: NativeLoopNestContext):
         # By the time we've reached here, our fused nest has already been created
 
@@ -717,13 +747,14 @@ class FusedSchedule(Schedule):
             return ValueError("Unexpected number of indices returned from fusion")
 
         context.mapping[id(self._fusing_index)] = fused_native_index
+        self._fusing_index._native = fused_native_index
 
         for i, common_idx in enumerate(self._common_indices):
-            context.mapping[id(common_idx)] = all_indices_post_fusion[1 + i]
+            context.mapping[id(common_idx)] = common_idx._native = all_indices_post_fusion[1 + i]
 
         unfused_begin = 1 + len(self._common_indices)
         for i, unfused in enumerate(self._unfused_indices):
-            context.mapping[id(unfused)] = all_indices_post_fusion[unfused_begin + i]
+            context.mapping[id(unfused)] = unfused._native = all_indices_post_fusion[unfused_begin + i]
 
         context.schedule = native_prime_sched
 
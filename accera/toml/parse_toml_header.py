@@ -3,76 +3,189 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See LICENSE in the project root for license information.
 # Authors:  Mason Remy
-# Requires: Python 3.7+, tomlkit
+# Requires: Python 3.7+, tomli (Python < 3.11 only)
 #
 # Utility to parse the TOML metadata from Accera headers
 ####################################################################################################
 
 import argparse
+import functools
+import hashlib
 import os
+import pickle
+import sys
 
-# Requires tomlkit: pip install tomlkit
-import tomlkit
+try:
+    import tomllib    # Python 3.11+
+except ImportError:
+    # Backport of the stdlib parser, requires tomli: pip install tomli
+    import tomli as tomllib
+
+# Metadata keys that distinguish an Accera sample variant module from a utility module.
+# Interned so the dict probes against parsed metadata short-circuit on pointer equality.
+_VARIANT_METADATA_KEYS = frozenset(
+    sys.intern(key) for key in ("_function", "_initialize_function", "_deinitialize_function", "domain")
+)
+
+# On-disk cache of parsed headers, keyed by content hash. Bump the version whenever the
+# pickled layout of AcceraLibraryData/AcceraModuleData changes.
+_DISK_CACHE_VERSION = 3
+_DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "accera", "toml")
 
 
 class AcceraModuleData:
-    def __init__(self, toml_table):
-        self.module_toml = toml_table
+    __slots__ = (
+        "module_toml", "name", "metadata", "_code_table", "is_accera_variant", "function_name",
+        "initialize_function_name", "deinitialize_function_name", "domain", "custom_metadata"
+    )
+
+    def __init__(self, toml_table, keep_raw=False):
+        # This constructor runs once per module in a library, so it works on locals:
+        # every self.attr or table re-index is a dict probe we don't need to repeat.
+        # By default the raw table is not retained, so read-only consumers don't pin
+        # the whole parsed document; pass keep_raw=True to keep module_toml alive.
+        metadata = toml_table["metadata"]
+        self.module_toml = toml_table if keep_raw else None
         self.name = toml_table["module_name"]
-        self.metadata = toml_table["metadata"]
-        self.code_table = toml_table["code"]
-        variant_metadata_keys = ["_function", "_initialize_function", "_deinitialize_function", "domain"]
-        self.is_accera_variant = True
-        for key in variant_metadata_keys:
-            if key not in self.metadata:
-                # Utility modules have TOML data, but don't have Accera sample variant metadata
-                self.is_accera_variant = False
-        if self.is_accera_variant:
-            self.function_name = self.metadata["_function"]
-            self.initialize_function_name = self.metadata["_initialize_function"]
-            self.deinitialize_function_name = self.metadata["_deinitialize_function"]
-            self.domain = self.metadata["domain"]
+        self.metadata = metadata
+        # without a retained raw table there is nothing to defer to, so bind the code
+        # reference now (one plain-dict probe); with keep_raw the fetch stays lazy
+        self._code_table = None if keep_raw else toml_table["code"]
+        # Utility modules have TOML data, but don't have Accera sample variant metadata;
+        # a single C-level subset test replaces the per-key membership loop
+        is_accera_variant = _VARIANT_METADATA_KEYS <= metadata.keys()
+        self.is_accera_variant = is_accera_variant
+        if is_accera_variant:
+            self.function_name = metadata["_function"]
+            self.initialize_function_name = metadata["_initialize_function"]
+            self.deinitialize_function_name = metadata["_deinitialize_function"]
+            self.domain = metadata["domain"]
             self.custom_metadata = {
-                key: self.metadata[key]
-                for key in self.metadata if key not in variant_metadata_keys
+                key: value
+                for key, value in metadata.items() if key not in _VARIANT_METADATA_KEYS
             }
 
+    @property
+    def code_table(self):
+        # Materialized lazily when the raw table is retained: most consumers only
+        # read the metadata, and the code block can dwarf the rest of the header.
+        # cached_property needs __dict__, so this is a manual getter compatible with
+        # __slots__; None marks "not yet fetched", which is unambiguous since TOML
+        # has no null value.
+        code_table = self._code_table
+        if code_table is None:
+            code_table = self._code_table = self.module_toml["code"]
+        return code_table
+
 
 class AcceraLibraryData:
-    def __init__(self, toml_document):
-        self.library_toml = toml_document
+    __slots__ = ("library_toml", "name", "module_names", "modules_table", "modules")
+
+    def __init__(self, toml_document, keep_raw=False):
+        modules_table = toml_document["modules"]
+        # the raw document back-references multiply retention for read-only callers,
+        # so they are opt-in; keep_raw=True preserves library_toml/modules_table
+        self.library_toml = toml_document if keep_raw else None
         self.name = toml_document["library_name"]
         self.module_names = toml_document["module_names"]
-        self.modules_table = toml_document["modules"]
-        self.modules = []
-        for module_name in self.modules_table:
-            self.modules.append(AcceraModuleData(self.modules_table[module_name]))
+        self.modules_table = modules_table if keep_raw else None
+        # drive module construction from the manifest so the modules table is not
+        # walked a second time, and parse order is guaranteed to match module_names
+        self.modules = [AcceraModuleData(modules_table[name], keep_raw) for name in self.module_names]
+
+
+def _disk_cache_path(contents):
+    digest = hashlib.blake2b(contents, digest_size=16).hexdigest()
+    return os.path.join(_DISK_CACHE_DIR, "{}.v{}.pkl".format(digest, _DISK_CACHE_VERSION))
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_toml_header_cached(path, mtime_ns, size):
+    # mtime_ns and size are only present to key the cache; a changed file produces a
+    # new key and the stale entry ages out of the LRU. A 1 MiB buffer slurps large
+    # headers in a few read() syscalls instead of the default 8 KiB's many.
+    with open(path, "rb", buffering=1 << 20) as f:
+        contents = f.read()
+
+    # Check the cross-process disk cache before parsing: unpickling the parsed header
+    # is much cheaper than running the TOML parser over it. The cache is keyed by
+    # content hash, so editing the header naturally misses. Cache I/O is best-effort:
+    # any failure (unreadable dir, corrupt or stale pickle) falls back to a parse.
+    cache_path = _disk_cache_path(contents)
+    try:
+        with open(cache_path, "rb", buffering=1 << 20) as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    library_data = AcceraLibraryData(tomllib.loads(contents.decode("utf-8")))
+
+    try:
+        os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+        # write-then-rename so concurrent readers never see a partial pickle
+        tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+        with open(tmp_path, "wb") as f:
+            pickle.dump(library_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError):
+        pass
+    return library_data
 
 
 def parse_toml_header(filepath):
+    # abspath costs a getcwd syscall per call; skip it for already-absolute paths
+    path = filepath if os.path.isabs(filepath) else os.path.abspath(filepath)
+    st = os.stat(path)
+    return _parse_toml_header_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def parse_toml_headers(filepaths):
+    # Batch API for bulk header ingestion. Parsing is CPU-bound pure Python, so a
+    # process pool sidesteps the GIL and scales with cores; results come back in
+    # input order. Workers populate the shared on-disk cache, so re-parses in any
+    # process are cheap. Imported lazily to keep single-file startup unaffected.
+    import concurrent.futures
+
+    filepaths = list(filepaths)
+    if len(filepaths) <= 1:
+        return [parse_toml_header(path) for path in filepaths]
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        return list(executor.map(parse_toml_header, filepaths, chunksize=8))
+
+
+def parse_toml_header_roundtrip(filepath):
+    # Style-preserving parse for callers that need to modify and re-emit the header.
+    # Read-only consumers should use parse_toml_header, which is much faster.
+    # Requires tomlkit: pip install tomlkit
+    import tomlkit
+
     path = os.path.abspath(filepath)
-    toml_doc = None
     with open(path, "r") as f:
-        file_contents = f.read()
-        toml_doc = tomlkit.parse(file_contents)
-    return AcceraLibraryData(toml_doc)
+        toml_doc = tomlkit.load(f)
+    # re-emitters need the style-preserving document, so keep the raw references
+    return AcceraLibraryData(toml_doc, keep_raw=True)
 
 
 def print_accera_toml_library_data(accera_library_data):
-    print("Library Name: {}".format(accera_library_data.name))
-    print("Module Names: {}".format(accera_library_data.module_names))
+    # Batch the report into one write: a print() call per line means a Python-level
+    # dispatch and potentially a syscall for every one of the ~10 lines per module
+    out = []
+    append = out.append
+    append("Library Name: {}".format(accera_library_data.name))
+    append("Module Names: {}".format(accera_library_data.module_names))
     for module in accera_library_data.modules:
-        print("\tModule: {}".format(module.name))
-        print("\t\tIs Accera Sample Variant: {}".format(module.is_accera_variant))
+        append("\tModule: {}".format(module.name))
+        append("\t\tIs Accera Sample Variant: {}".format(module.is_accera_variant))
         if module.is_accera_variant:
-            print("\t\tVariant Function: {}".format(module.function_name))
-            print("\t\tInit Function: {}".format(module.initialize_function_name))
-            print("\t\tDe-Init Function: {}".format(module.deinitialize_function_name))
-            print("\t\tDomain: {}".format(module.domain))
-            print("\t\tCustom Metadata Parameters:")
-            for key in module.custom_metadata:
-                print("\t\t\t{} : {}".format(key, module.custom_metadata[key]))
-        print()
+            append("\t\tVariant Function: {}".format(module.function_name))
+            append("\t\tInit Function: {}".format(module.initialize_function_name))
+            append("\t\tDe-Init Function: {}".format(module.deinitialize_function_name))
+            append("\t\tDomain: {}".format(module.domain))
+            append("\t\tCustom Metadata Parameters:")
+            for key, value in module.custom_metadata.items():
+                append("\t\t\t{} : {}".format(key, value))
+        append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():